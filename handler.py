@@ -4,29 +4,98 @@ import logging
 import socket
 import subprocess
 import sys
+import threading
 import time
-from typing import Any, Dict, List
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import icmplib
+except ImportError:  # optional: unprivileged ICMP without forking ping
+    icmplib = None
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent probes; threads are only spawned as needed.
+_MAX_WORKERS = 32
+
+DEFAULT_CACHE_TTL = 30.0
+
+# Maximum number of cached check results (least recently used evicted first)
+_RESULT_CACHE_SIZE = 1024
+
+# How long resolved / failed DNS lookups are reused (seconds)
+_DNS_TTL = 300.0
+_DNS_NEGATIVE_TTL = 30.0
+
+# Maximum number of formatted TTS strings kept (oldest evicted first)
+_FORMAT_CACHE_SIZE = 32
+
+_PHRASES = {
+    "nl": {
+        "none": "Er zijn geen servers geconfigureerd.",
+        "single": "{name} is {status}.",
+        "group": "{count} server{plural} {status}: {names}",
+    },
+    "en": {
+        "none": "No servers are configured.",
+        "single": "{name} is {status}.",
+        "group": "{count} server{plural} {status}: {names}",
+    },
+}
+
 
 class MonitoringHandler:
     """Perform health checks on configured servers."""
 
-    def __init__(self, servers: List[Dict[str, Any]]):
-        self.servers = servers
+    def __init__(self, servers: List[Dict[str, Any]], cache_ttl: float = DEFAULT_CACHE_TTL):
+        self._set_servers(servers)
+        self._ttl = cache_ttl
+        # probe key -> (monotonic time of check, result), in LRU order
+        self._cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # probe key -> pending probe, shared by concurrent callers
+        self._inflight: Dict[Tuple, Future] = {}
+        # guards _cache and _inflight
+        self._lock = threading.Lock()
+        self._icmp_permitted = True
+        self._fmt_cache: Dict[Tuple, str] = {}
+        # host -> (monotonic expiry, resolved addresses; empty on failure)
+        self._dns_cache: Dict[str, Tuple[float, List[str]]] = {}
         self._previous_state: Dict[str, bool] = {}
         self._last_results: List[Dict[str, Any]] = []
         self._last_check_time: float = 0.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=_MAX_WORKERS, thread_name_prefix="monitoring"
+        )
+        # Keep-alive connection pool shared by all HTTP(S) checks
+        self._session = requests.Session()
+        self._session.verify = False
+        adapter = HTTPAdapter(
+            pool_connections=_MAX_WORKERS, pool_maxsize=_MAX_WORKERS, max_retries=0
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Release the probe worker threads and pooled HTTP connections."""
+        self._executor.shutdown(wait=False)
+        self._session.close()
 
     def update_servers(self, servers: List[Dict[str, Any]]) -> None:
         """Update the server list at runtime."""
-        self.servers = servers
+        self._set_servers(servers)
+        with self._lock:
+            self._cache.clear()
+        # Only hosts of the current list are worth keeping resolved
+        self._dns_cache.clear()
         self._last_results = []
         self._last_check_time = 0.0
 
@@ -35,9 +104,8 @@ class MonitoringHandler:
         text_lower = text.lower()
 
         # Check for a specific server name
-        for server in self.servers:
-            name = server.get("name", "").lower()
-            if name and name in text_lower:
+        for name, server in self._name_index:
+            if name in text_lower:
                 result = self._check_server(server)
                 return self._format_single(result, language)
 
@@ -45,22 +113,115 @@ class MonitoringHandler:
         results = self.check_all()
         return self._format_all(results, language)
 
-    def check_all(self) -> List[Dict[str, Any]]:
-        """Check all configured servers and return results."""
-        results = []
-        for server in self.servers:
-            results.append(self._check_server(server))
-        return results
+    def _set_servers(self, servers: List[Dict[str, Any]]) -> None:
+        """Store the server list with normalized records and a name index."""
+        self.servers = servers
+        self._servers = [self._normalize(s) for s in servers]
+        # (lowercased name, record) pairs for matching names in queries
+        self._name_index: List[Tuple[str, Dict[str, Any]]] = [
+            (raw["name"].lower(), record)
+            for raw, record in zip(servers, self._servers)
+            if raw.get("name")
+        ]
+
+    @staticmethod
+    def _normalize(server: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve defaults, the check type and the probe target once per server."""
+        check_type = str(server.get("type", "ping")).lower()
+        host = server.get("host", "")
+        port = server.get("port")
+        url = server.get("url", "")
+
+        target_url = ""
+        error = None
+        if check_type in ("http", "https"):
+            target_url = url or f"{check_type}://{host}"
+            if port and not url:
+                target_url = f"{check_type}://{host}:{port}"
+        elif check_type == "ssh":
+            try:
+                port = int(port) if port else 22
+            except (TypeError, ValueError) as e:
+                logger.warning("Invalid SSH port for %s: %r", server.get("name"), port)
+                error = str(e)
+
+        name = server.get("name", "Unknown")
+        return {
+            "name": name,
+            "type": check_type,
+            "host": host,
+            "port": port,
+            "url": url,
+            "target_url": target_url,
+            # Identifies the probe for the result cache and single-flight:
+            # same-named servers with different targets are probed separately,
+            # and the name is included because results carry it
+            "key": (name, check_type, host, str(port), target_url),
+            # Config problem found while normalizing; reported instead of probing
+            "error": error,
+        }
+
+    def check_server(self, server: Dict[str, Any], fresh: bool = False) -> Dict[str, Any]:
+        """Check a single server given as a raw config entry."""
+        return self._check_server(self._normalize(server), fresh)
+
+    def check_all(
+        self, timeout: Optional[float] = None, fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Check all configured servers concurrently and return results.
+
+        Results are returned in the same order as ``self.servers``. Each
+        result carries ``checked_at`` (unix time of the probe) and ``ttl``
+        (seconds it may be served from cache), so callers can tell when a
+        result is stale, like HTTP ``Cache-Control: max-age``.
+
+        With ``timeout``, waits at most that many seconds in total; servers
+        whose probe has not finished by then are reported offline with
+        ``error`` set, and their probe keeps running in the background.
+        With ``fresh``, cached results are ignored and every server is probed.
+        """
+        if not self._servers:
+            return []
+        futures = [
+            self._executor.submit(self._check_server, s, fresh) for s in self._servers
+        ]
+        done, _ = wait(futures, timeout=timeout)
+        return [
+            future.result() if future in done else self._timed_out_result(server)
+            for future, server in zip(futures, self._servers)
+        ]
+
+    def iter_results(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yield check results as each probe completes.
+
+        Results arrive in completion order rather than config order, so a
+        caller that only needs e.g. "is anything online?" can stop at the
+        first match instead of waiting for the slowest probe. With
+        ``timeout``, stops yielding once that many seconds have passed.
+        """
+        futures = [self._executor.submit(self._check_server, s) for s in self._servers]
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                yield future.result()
+        except FuturesTimeoutError:
+            logger.debug("Stopped waiting for server checks after %.1fs", timeout)
+        finally:
+            # Caller stopped early or timed out: drop probes not yet started
+            for future in futures:
+                future.cancel()
 
     def get_alerts(self) -> List[str]:
         """Run checks and return alert strings for online-to-offline transitions.
 
         Only returns alerts for servers that changed from online to offline.
         The first check cycle establishes baseline state (no alerts).
+        Always probes (``fresh``): a cached result could hide a transition
+        for up to a TTL when the check interval is shorter than the TTL.
+        Concurrent callers still share in-flight probes.
         """
-        results = self.check_all()
+        results = self.check_all(fresh=True)
         self._last_results = results
-        self._last_check_time = time.time()
+        self._last_check_time = self._checked_at(results)
 
         alerts = []
         for r in results:
@@ -82,40 +243,85 @@ class MonitoringHandler:
         """Return full status for the dashboard (cached from last check cycle)."""
         if not self._last_results:
             self._last_results = self.check_all()
-            self._last_check_time = time.time()
+            self._last_check_time = self._checked_at(self._last_results)
 
         return {
             "servers": self._last_results,
             "last_check": self._last_check_time,
         }
 
-    def _check_server(self, server: Dict[str, Any]) -> Dict[str, Any]:
-        """Check a single server's health."""
-        name = server.get("name", "Unknown")
-        check_type = server.get("type", "ping").lower()
-        host = server.get("host", "")
-        port = server.get("port")
-        url = server.get("url", "")
+    @staticmethod
+    def _checked_at(results: List[Dict[str, Any]]) -> float:
+        """When the data in ``results`` was gathered: the oldest probe time."""
+        return min((r["checked_at"] for r in results), default=time.time())
 
-        result = {
-            "name": name,
-            "host": host,
-            "type": check_type,
-            "online": False,
-            "response_time_ms": None,
-            "checked_at": time.time(),
-        }
+    def _check_server(self, server: Dict[str, Any], fresh: bool = False) -> Dict[str, Any]:
+        """Check a normalized server's health, reusing a recent result if fresh.
+
+        Probes are single-flight: if a probe for the same target is already
+        running, concurrent callers wait for its result instead of issuing
+        a duplicate probe. ``fresh`` skips the result cache (a probe that
+        is already running is still shared).
+        """
+        key = server["key"]
+        with self._lock:
+            cached = None if fresh else self._cached_result(key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(key)
+            if future is not None:
+                owner = False
+            else:
+                owner = True
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        result = None
+        try:
+            result = self._probe_server(server)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                if result is not None and self._ttl > 0:
+                    self._cache[key] = (time.monotonic(), result)
+                    self._cache.move_to_end(key)
+                    if len(self._cache) > _RESULT_CACHE_SIZE:
+                        self._cache.popitem(last=False)
+                self._inflight.pop(key, None)
+
+    def _cached_result(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result for probe ``key``. Caller holds ``_lock``."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self._ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _probe_server(self, server: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a live health check against a single normalized server."""
+        name = server["name"]
+        check_type = server["type"]
+        host = server["host"]
+        result = self._new_result(server)
+        if server["error"]:
+            result["error"] = server["error"]
+            return result
 
         try:
             start = time.monotonic()
             if check_type in ("http", "https"):
-                target_url = url or f"{check_type}://{host}"
-                if port and not url:
-                    target_url = f"{check_type}://{host}:{port}"
-                result["online"] = self._check_http(target_url)
+                result["online"] = self._check_http(server["target_url"])
             elif check_type == "ssh":
-                ssh_port = int(port) if port else 22
-                result["online"] = self._check_ssh(host, ssh_port)
+                result["online"] = self._check_ssh(host, server["port"])
             else:
                 result["online"] = self._check_ping(host)
             result["response_time_ms"] = round((time.monotonic() - start) * 1000, 1)
@@ -125,118 +331,188 @@ class MonitoringHandler:
 
         return result
 
+    def _new_result(self, server: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an offline result skeleton for a normalized server."""
+        return {
+            "name": server["name"],
+            "host": server["host"],
+            "type": server["type"],
+            "online": False,
+            "response_time_ms": None,
+            "checked_at": time.time(),
+            "ttl": self._ttl,
+        }
+
+    def _timed_out_result(self, server: Dict[str, Any]) -> Dict[str, Any]:
+        result = self._new_result(server)
+        result["error"] = "Timed out"
+        return result
+
     def _check_ping(self, host: str) -> bool:
         """Ping a host and return True if reachable.
 
-        Tries ICMP ping first. If the ping binary is not available
-        (e.g. inside Docker), falls back to TCP connection attempts.
+        Every address the host resolves to is tried in turn (like
+        ``socket.create_connection``), so an unreachable first record, e.g.
+        an AAAA answer in an IPv4-only container, does not mark it offline.
         """
         if not host:
             return False
+        return any(self._ping_address(address) for address in self._resolve(host))
+
+    def _ping_address(self, address: str) -> bool:
+        """Ping a single address and return True if it answers.
+
+        Uses an unprivileged ICMP datagram socket via icmplib when available,
+        so no process is forked per check. Otherwise (or when the kernel does
+        not allow unprivileged ICMP) the ping binary is used, and if that is
+        missing too (e.g. inside Docker) falls back to TCP connection attempts.
+        """
+        if icmplib is not None and self._icmp_permitted:
+            try:
+                return icmplib.ping(address, count=1, timeout=2, privileged=False).is_alive
+            except icmplib.SocketPermissionError:
+                logger.info("Unprivileged ICMP not permitted, using ping binary instead")
+                self._icmp_permitted = False
+            except icmplib.ICMPLibError:
+                return False
         try:
             if sys.platform == "win32":
-                cmd = ["ping", "-n", "1", "-w", "2000", host]
+                cmd = ["ping", "-n", "1", "-w", "2000", address]
             else:
-                cmd = ["ping", "-c", "1", "-W", "2", host]
-            result = subprocess.run(cmd, capture_output=True, timeout=5)
+                cmd = ["ping", "-c", "1", "-W", "2", address]
+            result = subprocess.run(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5
+            )
             return result.returncode == 0
         except FileNotFoundError:
-            logger.debug("ping binary not found, using TCP fallback for %s", host)
-            return self._tcp_ping(host)
+            logger.debug("ping binary not found, using TCP fallback for %s", address)
+            return self._tcp_ping([address])
         except (subprocess.TimeoutExpired, Exception):
             return False
 
-    def _tcp_ping(self, host: str, ports: tuple = (80, 443, 22)) -> bool:
+    def _tcp_ping(self, addresses: List[str], ports: tuple = (80, 443, 22)) -> bool:
         """TCP-based reachability check as fallback when ping is unavailable.
 
         A ConnectionRefusedError still means the host is up (it sent RST).
         Only timeouts and network errors indicate the host is truly unreachable.
         """
         for port in ports:
-            sock = None
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(2)
-                sock.connect((host, port))
-                return True
-            except ConnectionRefusedError:
-                return True
-            except (socket.timeout, OSError):
-                continue
-            finally:
-                if sock:
-                    try:
-                        sock.close()
-                    except Exception:
-                        pass
+            for address in addresses:
+                try:
+                    socket.create_connection((address, port), timeout=2).close()
+                    return True
+                except ConnectionRefusedError:
+                    return True
+                except OSError:
+                    continue
         return False
 
     def _check_ssh(self, host: str, port: int = 22) -> bool:
-        """Check if an SSH port is open and responding."""
+        """Check if an SSH port is open and responding.
+
+        Connects to the first address of the host that accepts the
+        connection, like ``socket.create_connection`` with a hostname.
+        """
         if not host:
             return False
-        sock = None
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect((host, port))
-            banner = sock.recv(256)
-            return banner.startswith(b"SSH-")
-        except Exception:
-            return False
-        finally:
-            if sock:
-                try:
-                    sock.close()
-                except Exception:
-                    pass
+        for address in self._resolve(host):
+            try:
+                sock = socket.create_connection((address, port), timeout=5)
+            except OSError:
+                continue
+            try:
+                with sock:
+                    banner = sock.recv(256)
+                return banner.startswith(b"SSH-")
+            except Exception:
+                return False
+        return False
 
     def _check_http(self, url: str) -> bool:
-        """Check if an HTTP endpoint is reachable."""
+        """Check if an HTTP endpoint is reachable.
+
+        Sends a HEAD request over the pooled session so no body is
+        transferred, and only falls back to GET when the server does not
+        support HEAD.
+        """
         if not url:
             return False
+        # No _resolve() pre-check here: requests resolves the URL itself
+        # (possibly via a configured proxy), so a local lookup would only
+        # add a round-trip and could wrongly mark proxy-only hosts offline.
         try:
-            r = requests.get(url, timeout=5, verify=False)
+            r = self._session.head(url, timeout=5, allow_redirects=False)
+            if r.status_code in (405, 501):
+                # Only the status line is needed; don't download the body
+                with self._session.get(url, timeout=5, stream=True) as r:
+                    return r.status_code < 500
             return r.status_code < 500
         except Exception:
             return False
 
+    def _resolve(self, host: str) -> List[str]:
+        """Resolve a host to all of its addresses, caching the answer.
+
+        Returns an empty list when the lookup fails. Failed lookups are
+        cached for a shorter time so an unresolvable host fails immediately
+        instead of waiting on DNS every check.
+        """
+        now = time.monotonic()
+        entry = self._dns_cache.get(host)
+        if entry and now < entry[0]:
+            return entry[1]
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            # Unique addresses, in the resolver's preference order
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            self._dns_cache[host] = (now + _DNS_TTL, addresses)
+        except (socket.gaierror, UnicodeError):
+            logger.debug("DNS lookup failed for %s", host)
+            addresses = []
+            self._dns_cache[host] = (now + _DNS_NEGATIVE_TTL, addresses)
+        return addresses
+
     def _format_single(self, result: Dict[str, Any], language: str) -> str:
         """Format a single server check result for TTS."""
         name = result["name"]
         online = result["online"]
-        if language == "nl":
-            status = "online" if online else "offline"
-            return f"{name} is {status}."
-        else:
-            status = "online" if online else "offline"
-            return f"{name} is {status}."
+        key = (language, name, online)
+        cached = self._fmt_cache.get(key)
+        if cached is not None:
+            return cached
+        phrases = _PHRASES.get(language, _PHRASES["en"])
+        text = phrases["single"].format(name=name, status="online" if online else "offline")
+        return self._remember_format(key, text)
 
     def _format_all(self, results: List[Dict[str, Any]], language: str) -> str:
         """Format all server check results for TTS."""
+        key = (language, tuple((r["name"], r["online"]) for r in results))
+        cached = self._fmt_cache.get(key)
+        if cached is not None:
+            return cached
+
+        phrases = _PHRASES.get(language, _PHRASES["en"])
         if not results:
-            if language == "nl":
-                return "Er zijn geen servers geconfigureerd."
-            return "No servers are configured."
-
-        online = [r for r in results if r["online"]]
-        offline = [r for r in results if not r["online"]]
-
-        if language == "nl":
-            parts = []
-            if online:
-                names = ", ".join(r["name"] for r in online)
-                parts.append(f"{len(online)} server{'s' if len(online) != 1 else ''} online: {names}")
-            if offline:
-                names = ", ".join(r["name"] for r in offline)
-                parts.append(f"{len(offline)} server{'s' if len(offline) != 1 else ''} offline: {names}")
-            return ". ".join(parts) + "."
-        else:
-            parts = []
-            if online:
-                names = ", ".join(r["name"] for r in online)
-                parts.append(f"{len(online)} server{'s' if len(online) != 1 else ''} online: {names}")
-            if offline:
-                names = ", ".join(r["name"] for r in offline)
-                parts.append(f"{len(offline)} server{'s' if len(offline) != 1 else ''} offline: {names}")
-            return ". ".join(parts) + "."
+            return self._remember_format(key, phrases["none"])
+
+        online, offline = [], []
+        for r in results:
+            (online if r["online"] else offline).append(r["name"])
+
+        parts = []
+        for status, names in (("online", online), ("offline", offline)):
+            if names:
+                parts.append(phrases["group"].format(
+                    count=len(names),
+                    plural="s" if len(names) != 1 else "",
+                    status=status,
+                    names=", ".join(names),
+                ))
+        return self._remember_format(key, ". ".join(parts) + ".")
+
+    def _remember_format(self, key: Tuple, text: str) -> str:
+        """Store a formatted string, evicting the oldest entry when full."""
+        self._fmt_cache[key] = text
+        if len(self._fmt_cache) > _FORMAT_CACHE_SIZE:
+            self._fmt_cache.pop(next(iter(self._fmt_cache)), None)
+        return text
@@ -1,16 +1,60 @@
 """Server monitoring plugin - health checks via ping, HTTP(S), and SSH."""
 
-import html as html_mod
+import html
 import json
 import logging
 import re
+import threading
 import time
-from typing import Any, Dict, List
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from ..base import ConfigField, DashboardPage, DashboardWidget, PluginBase, PluginMeta
+from .handler import MonitoringHandler
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON encoding/decoding
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Upper bound (seconds) on how long a servers/status payload is reused
+# across dashboard polls; shorter if the check interval is shorter
+_STATUS_CACHE_TTL = 10.0
+
+# Wall-clock cap for on-demand checks made while serving an API request
+_API_CHECK_TIMEOUT = 5.0
+
+# Floor (seconds) for MONITORING_CHECK_INTERVAL; 0 or negative values would
+# make the monitoring loop spin
+_MIN_CHECK_INTERVAL = 10
+
+_VALID_TYPES = frozenset({"ping", "http", "https", "ssh"})
+
+_ACTION_RE = re.compile(r"^servers/(\d+)/(delete|test|update)$")
+
+# Placeholders in _SETTINGS_JS_TEMPLATE, substituted in a single pass
+_JS_PLACEHOLDER_RE = re.compile(r"__(?:SERVERS|STATUS)_JSON__")
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _loads(raw: str) -> Any:
+    """Parse JSON, using orjson when it is installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    catch the same exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class ServerMonitoringPlugin(PluginBase):
     """Server monitoring integration as a plugin."""
@@ -77,6 +121,12 @@ class ServerMonitoringPlugin(PluginBase):
                 default="60",
                 hot_reload=True,
             ),
+            ConfigField(
+                key="MONITORING_CACHE_TTL",
+                label="Result Cache TTL (sec)",
+                default="30",
+                hot_reload=True,
+            ),
         ]
 
     # --- Dashboard ---
@@ -105,23 +155,56 @@ class ServerMonitoringPlugin(PluginBase):
     def setup(self, context) -> None:
         super().setup(context)
         self._handler = None
+        self._cached_servers: Optional[List[Dict[str, Any]]] = None
+        # Raw MONITORING_SERVERS value _cached_servers was parsed from
+        self._servers_raw: Optional[str] = None
+        # Serialized _cached_servers, seeded into the settings page
+        self._servers_json: Optional[str] = None
+        # (monotonic time, payload) of the last servers/status response
+        self._status_cache: Optional[Tuple[float, dict]] = None
+        self._status_lock = threading.Lock()
+        # Fixed-path API actions; indexed actions are matched by _ACTION_RE
+        self._actions = {
+            "servers/list": lambda data: {"servers": self._load_servers()},
+            "servers/status": lambda data: self._action_full_status(),
+            "servers/add": self._action_add_server,
+            "servers/save-all": self._action_save_all_servers,
+            "servers/test_all": lambda data: self._action_test_all(),
+        }
+        self._pages = {
+            "settings": self._render_settings_page,
+            "status": self._render_status_page,
+        }
+        self._widgets = {
+            "status_overview": self._render_status_widget,
+        }
 
     def on_enable(self) -> None:
-        from .handler import MonitoringHandler
-        servers = self._load_servers()
-        self._handler = MonitoringHandler(servers)
+        self._status_cache = None
+        servers = self._reload_servers()
+        # Hot reload re-enables without a disable. Swap in the new handler
+        # before closing the old one, so callers never find a closed handler
+        # on self._handler.
+        old, self._handler = self._handler, MonitoringHandler(
+            servers, cache_ttl=self._get_cache_ttl()
+        )
+        if old:
+            old.close()
 
     def on_disable(self) -> None:
-        self._handler = None
+        old, self._handler = self._handler, None
+        if old:
+            old.close()
+        self._status_cache = None
 
     def test_connection(self) -> bool:
         servers = self._load_servers()
         if not servers:
             return True
-        from .handler import MonitoringHandler
-        handler = MonitoringHandler(servers)
-        results = handler.check_all()
-        return any(r.get("online") for r in results)
+        with self._using_handler(servers) as handler:
+            # Closing the generator cancels probes still queued after the first hit
+            with closing(handler.iter_results(timeout=_API_CHECK_TIMEOUT)) as results:
+                return any(r.get("online") for r in results)
 
     # --- Handle voice commands ---
 
@@ -138,28 +221,27 @@ class ServerMonitoringPlugin(PluginBase):
         """Return alert strings for the monitoring loop in agent.py.
 
         Only returns alerts for servers that transitioned from online to offline.
-        Returns an empty list when all servers are stable.
+        Returns an empty list when all servers are stable. Every call probes
+        the servers (bypassing the MONITORING_CACHE_TTL result cache) so no
+        transition is missed; the per-server ``checked_at`` and ``ttl``
+        fields in servers/status tell when results become stale.
         """
-        if self._handler:
-            return self._handler.get_alerts()
-        return []
+        if not self._handler or not self._handler.servers:
+            return []
+        alerts = self._handler.get_alerts()
+        # Serve the fresh cycle to the dashboard right away
+        status = self._status_payload(self._handler.get_full_status())
+        self._status_cache = (time.monotonic(), status)
+        return alerts
 
     # --- API Actions (via generic plugin action route) ---
 
     def handle_api_action(self, action: str, data: dict) -> dict:
-        if action == "servers/list":
-            return {"servers": self._load_servers()}
+        fn = self._actions.get(action)
+        if fn:
+            return fn(data)
 
-        if action == "servers/status":
-            return self._action_full_status()
-
-        if action == "servers/add":
-            return self._action_add_server(data)
-
-        if action == "servers/save-all":
-            return self._action_save_all_servers(data)
-
-        m = re.match(r"^servers/(\d+)/(delete|test|update)$", action)
+        m = _ACTION_RE.match(action)
         if m:
             index = int(m.group(1))
             op = m.group(2)
@@ -172,27 +254,38 @@ class ServerMonitoringPlugin(PluginBase):
 
         return {"error": "Unknown action"}
 
-    def _action_add_server(self, data: dict) -> dict:
-        name = data.get("name", "").strip()
-        check_type = data.get("type", "ping").strip().lower()
-        host = data.get("host", "").strip()
-        port = data.get("port", "").strip()
-        url = data.get("url", "").strip()
+    def _parse_server_payload(self, data: dict) -> Tuple[Optional[dict], Optional[str]]:
+        """Validate a single-server payload; return (server, None) or (None, error)."""
+        name = str(data.get("name", "")).strip()
+        check_type = str(data.get("type", "ping")).strip().lower()
+        host = str(data.get("host", "")).strip()
+        port = str(data.get("port", "")).strip()
+        url = str(data.get("url", "")).strip()
 
         if not name:
-            return {"error": "Server name is required"}
-        if check_type in ("http", "https") and not url:
-            return {"error": "URL is required for HTTP(S)"}
-        if check_type in ("ping", "ssh") and not host:
-            return {"error": "Host is required for " + check_type.upper()}
-        if check_type not in ("ping", "http", "https", "ssh"):
-            return {"error": "Type must be ping, http, https, or ssh"}
+            return None, "Server name is required"
+        if check_type not in _VALID_TYPES:
+            return None, "Type must be ping, http, https, or ssh"
+        if check_type in ("http", "https"):
+            if not url:
+                return None, "URL is required for HTTP(S)"
+        elif not host:
+            return None, "Host is required for " + check_type.upper()
 
         server = {"name": name, "type": check_type, "host": host}
         if port:
-            server["port"] = int(port)
+            try:
+                server["port"] = int(port)
+            except ValueError:
+                return None, "Port must be a number"
         if url:
             server["url"] = url
+        return server, None
+
+    def _action_add_server(self, data: dict) -> dict:
+        server, error = self._parse_server_payload(data)
+        if error:
+            return {"error": error}
 
         servers = self._load_servers()
         servers.append(server)
@@ -212,39 +305,30 @@ class ServerMonitoringPlugin(PluginBase):
         servers = self._load_servers()
         if index < 0 or index >= len(servers):
             return {"error": "Invalid server index"}
-        from .handler import MonitoringHandler
-        handler = MonitoringHandler(servers)
-        return handler._check_server(servers[index])
+        with self._using_handler(servers) as handler:
+            # An explicit test click should probe, not replay a cached result
+            return handler.check_server(servers[index], fresh=True)
+
+    def _action_test_all(self) -> dict:
+        """Probe every server in one request (dashboard "Test All")."""
+        servers = self._load_servers()
+        if not servers:
+            return {"results": []}
+        with self._using_handler(servers) as handler:
+            return {"results": handler.check_all(timeout=_API_CHECK_TIMEOUT, fresh=True)}
 
     def _action_update_server(self, index: int, data: dict) -> dict:
         servers = self._load_servers()
         if index < 0 or index >= len(servers):
             return {"error": "Invalid server index"}
 
-        name = data.get("name", "").strip()
-        check_type = data.get("type", "ping").strip().lower()
-        host = data.get("host", "").strip()
-        port = data.get("port", "").strip()
-        url = data.get("url", "").strip()
-
-        if not name:
-            return {"error": "Server name is required"}
-        if check_type in ("http", "https") and not url:
-            return {"error": "URL is required for HTTP(S)"}
-        if check_type in ("ping", "ssh") and not host:
-            return {"error": "Host is required for " + check_type.upper()}
-        if check_type not in ("ping", "http", "https", "ssh"):
-            return {"error": "Type must be ping, http, https, or ssh"}
-
-        server = {"name": name, "type": check_type, "host": host}
-        if port:
-            server["port"] = int(port)
-        if url:
-            server["url"] = url
+        server, error = self._parse_server_payload(data)
+        if error:
+            return {"error": error}
 
         servers[index] = server
         self._save_servers(servers)
-        logger.info("Updated server %s (index %d)", name, index)
+        logger.info("Updated server %s (index %d)", server["name"], index)
         return {"success": True, "server": server}
 
     def _action_save_all_servers(self, data: dict) -> dict:
@@ -253,164 +337,578 @@ class ServerMonitoringPlugin(PluginBase):
         if not isinstance(servers, list):
             return {"error": "Invalid server list"}
         cleaned = []
-        for s in servers:
-            name = str(s.get("name", "")).strip()
-            check_type = str(s.get("type", "ping")).strip().lower()
-            host = str(s.get("host", "")).strip()
-            port = str(s.get("port", "")).strip()
-            url = str(s.get("url", "")).strip()
-            if not name:
-                return {"error": "All servers must have a name"}
-            if check_type in ("http", "https") and not url:
-                return {"error": f"URL is required for {name}"}
-            if check_type in ("ping", "ssh") and not host:
-                return {"error": f"Host is required for {name}"}
-            if check_type not in ("ping", "http", "https", "ssh"):
-                return {"error": f"Invalid type for {name}"}
-            entry = {"name": name, "type": check_type, "host": host}
-            if port:
-                entry["port"] = int(port)
-            if url:
-                entry["url"] = url
-            cleaned.append(entry)
+        for i, entry in enumerate(servers):
+            if not isinstance(entry, dict):
+                return {"error": "Invalid server list"}
+            server, error = self._parse_server_payload(entry)
+            if error:
+                label = str(entry.get("name", "")).strip() or f"Server {i + 1}"
+                return {"error": f"{label}: {error}"}
+            cleaned.append(server)
         self._save_servers(cleaned)
-        return {"success": True, "count": len(cleaned)}
+        return {"success": True, "count": len(cleaned), "servers": cleaned}
 
     def _action_full_status(self) -> dict:
-        """Return full status from the last monitoring cycle."""
+        """Return full status from the last monitoring cycle.
+
+        The payload is reused for up to min(check interval, 10 s), so
+        several open dashboard tabs polling at once cost a single status
+        build. Refreshes are single-flight: concurrent pollers wait for
+        the one in progress (which, without a live handler, is a round
+        of probes) instead of starting their own.
+        """
+        if not self._load_servers():
+            return self._status_payload({"servers": [], "last_check": 0})
+        ttl = min(self._get_interval(), _STATUS_CACHE_TTL)
+        cached = self._status_cache
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        with self._status_lock:
+            cached = self._status_cache
+            if cached and time.monotonic() - cached[0] < ttl:
+                return cached[1]
+            status = self._status_payload(self._build_full_status())
+            self._status_cache = (time.monotonic(), status)
+            return status
+
+    def _status_payload(self, status: dict) -> dict:
+        """Add ``check_interval`` so clients pace their polling to the backend."""
+        return dict(status, check_interval=self._get_interval())
+
+    def _build_full_status(self) -> dict:
         if self._handler:
             return self._handler.get_full_status()
-        from .handler import MonitoringHandler
-        servers = self._load_servers()
-        if not servers:
-            return {"servers": [], "last_check": 0}
-        handler = MonitoringHandler(servers)
-        results = handler.check_all()
+        handler = MonitoringHandler(self._load_servers(), cache_ttl=self._get_cache_ttl())
+        try:
+            results = handler.check_all(timeout=_API_CHECK_TIMEOUT)
+        finally:
+            handler.close()
         return {"servers": results, "last_check": time.time()}
 
     # --- Dashboard rendering ---
 
     def render_widget(self, widget_id: str) -> str:
-        if widget_id == "status_overview":
-            return self._render_status_widget()
-        return ""
+        render = self._widgets.get(widget_id)
+        return render() if render else ""
 
     def render_page(self, page_id: str) -> str:
-        if page_id == "settings":
-            return self._render_settings_page()
-        if page_id == "status":
-            return self._render_status_page()
-        return ""
+        render = self._pages.get(page_id)
+        return render() if render else ""
 
     # --- Internal helpers ---
 
     def _load_servers(self) -> List[Dict[str, Any]]:
-        """Load server list from database/env."""
+        """Return the server list, reading it from database/env only once.
+
+        The parsed list is kept until it is saved or the plugin is
+        re-enabled. Callers get their own list copy.
+        """
+        if self._cached_servers is None:
+            return self._reload_servers()
+        return list(self._cached_servers)
+
+    def _reload_servers(self) -> List[Dict[str, Any]]:
+        """Re-read the server list, parsing it only if the raw value changed."""
+        raw = self._read_servers_raw()
+        if self._cached_servers is None or raw != self._servers_raw:
+            self._cached_servers = self._parse_servers(raw)
+            self._servers_raw = raw
+            self._servers_json = None
+        return list(self._cached_servers)
+
+    def _read_servers_raw(self) -> str:
+        """Read the raw server list JSON from database/env."""
         raw = self.context.get_env("MONITORING_SERVERS", "[]") if self.context else "[]"
         # Strip surrounding quotes (from .env shell syntax)
-        if raw and len(raw) >= 2:
-            if (raw[0] == "'" and raw[-1] == "'") or (raw[0] == '"' and raw[-1] == '"'):
-                raw = raw[1:-1]
+        if raw and len(raw) >= 2 and raw[0] in ("'", '"') and raw[-1] == raw[0]:
+            raw = raw[1:-1]
+        return raw or ""
+
+    @staticmethod
+    def _parse_servers(raw: str) -> List[Dict[str, Any]]:
+        """Parse a raw server list, falling back to [] when it is invalid."""
         try:
-            servers = json.loads(raw) if raw else []
+            servers = _loads(raw) if raw else []
         except json.JSONDecodeError:
             logger.warning("Failed to parse MONITORING_SERVERS: %s", raw[:100])
             servers = []
-        return servers if isinstance(servers, list) else []
+        if not isinstance(servers, list):
+            servers = []
+        return servers
+
+    @contextmanager
+    def _using_handler(self, servers: List[Dict[str, Any]]) -> Iterator[MonitoringHandler]:
+        """Yield the live handler, or a temporary one when the plugin is disabled."""
+        if self._handler:
+            yield self._handler
+            return
+        handler = MonitoringHandler(servers, cache_ttl=self._get_cache_ttl())
+        try:
+            yield handler
+        finally:
+            handler.close()
+
+    def _get_interval_raw(self) -> str:
+        """Read the stored check interval as-is (what the host loop uses)."""
+        return self.context.get_env("MONITORING_CHECK_INTERVAL", "60") if self.context else "60"
+
+    def _get_interval(self) -> int:
+        """Read the monitoring check interval in seconds (at least 10)."""
+        raw = self._get_interval_raw()
+        try:
+            return max(_MIN_CHECK_INTERVAL, int(raw))
+        except (TypeError, ValueError):
+            logger.warning("Invalid MONITORING_CHECK_INTERVAL: %s", raw)
+            return 60
+
+    def _get_cache_ttl(self) -> float:
+        """Read the result cache TTL in seconds (0 disables caching)."""
+        raw = self.context.get_env("MONITORING_CACHE_TTL", "30") if self.context else "30"
+        try:
+            return max(0.0, float(raw))
+        except (TypeError, ValueError):
+            logger.warning("Invalid MONITORING_CACHE_TTL: %s", raw)
+            return 30.0
 
     def _save_servers(self, servers: List[Dict[str, Any]]) -> None:
         """Save server list to database and update handler."""
-        self.context.set_env("MONITORING_SERVERS", json.dumps(servers))
+        raw = _dumps(servers)
+        self.context.set_env("MONITORING_SERVERS", raw)
+        self._cached_servers = list(servers)
+        self._servers_raw = raw
+        self._servers_json = raw
+        self._status_cache = None
         if self._handler:
             self._handler.update_servers(servers)
 
     def _render_status_widget(self) -> str:
         """Compact widget showing online/offline counts."""
-        return """
+        return _WIDGET_HTML
+
+    def _render_settings_page(self) -> str:
+        """Settings page with server management form."""
+        # Show the stored value, not the clamped one: the host loop runs on
+        # what is stored, so a bad value must stay visible until re-saved
+        interval = html.escape(str(self._get_interval_raw()))
+        servers = self._load_servers()
+        if self._servers_json is None:
+            self._servers_json = _dumps(servers)
+        servers_json = self._servers_json
+
+        # The list itself is rendered client-side from the seeded JSON;
+        # only the empty-state copy is rendered here.
+        list_html = "" if servers else _EMPTY_LIST_HTML
+
+        # Seed the last known statuses too, so loading the page needs no
+        # request and never triggers probes
+        cached = self._status_cache
+        values = {
+            "__SERVERS_JSON__": servers_json,
+            "__STATUS_JSON__": _dumps(cached[1]["servers"] if cached else []),
+        }
+        js_code = _JS_PLACEHOLDER_RE.sub(lambda m: values[m.group(0)], _SETTINGS_JS_TEMPLATE)
+
+        return _SETTINGS_PAGE_TEMPLATE.format(
+            list_html=list_html, interval=interval, js_code=js_code
+        )
+
+    def _render_status_page(self) -> str:
+        """Live status page with auto-refresh."""
+        return _STATUS_PAGE_HTML
+
+
+# --- Dashboard templates (built once at import) ---
+
+_WIDGET_HTML = """
         <div id="mon-widget" style="text-align:center;padding:8px">
             <div id="mon-widget-text" style="color:#94a3b8">Loading...</div>
         </div>
         <script>
         (function() {
             const A = '/api/plugins/server_monitoring/action';
+            const root = document.getElementById('mon-widget-text');
+            if (!root) return;
+            // Poll period; follows the server's check interval once known
+            let period = 30000;
+            // Set once the widget is removed from the page; stops all polling
+            let stopped = false;
+            let onDetach = () => {};
+
+            function setHtml(html) {
+                if (root.isConnected) root.innerHTML = html;
+            }
+
+            function render(d) {
+                if (d.check_interval) period = Math.max(10000, d.check_interval * 1000);
+                const results = d.servers || [];
+                if (!results.length) {
+                    setHtml('<span style="color:#64748b">No servers configured</span>');
+                    return;
+                }
+                const on = results.filter(r => r.online).length;
+                const off = results.length - on;
+                let html = '';
+                if (on) html += '<span style="color:#22c55e;font-weight:600">' + on + ' online</span>';
+                if (on && off) html += ' &middot; ';
+                if (off) html += '<span style="color:#ef4444;font-weight:600">' + off + ' offline</span>';
+                setHtml(html);
+            }
+
+            // At most one status request in flight; a newer refresh or the
+            // tab being hidden aborts the previous one
+            let inflight = null;
+
             async function refresh() {
+                if (inflight) inflight.abort();
+                const ctrl = inflight = new AbortController();
                 try {
-                    const r = await fetch(A + '/servers/status');
+                    const r = await fetch(A + '/servers/status', {signal: ctrl.signal});
                     const d = await r.json();
-                    const results = d.servers || [];
-                    if (!results.length) {
-                        document.getElementById('mon-widget-text').innerHTML =
-                            '<span style="color:#64748b">No servers configured</span>';
+                    render(d);
+                    return d;
+                } catch(e) {
+                    if (e.name === 'AbortError') return null;
+                    setHtml('<span style="color:#ef4444">Error</span>');
+                    return null;
+                } finally {
+                    if (inflight === ctrl) inflight = null;
+                }
+            }
+
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden && inflight) inflight.abort();
+            });
+
+            // Only visible tabs poll. One of them (the holder of a Web Lock)
+            // fetches and shares each result with the other tabs over a
+            // BroadcastChannel; a tab gives the lock up when it is hidden.
+            // Without those APIs every visible tab polls on its own.
+            let timer = null;
+            let lastRun = 0;
+
+            function schedule(tick) {
+                clearTimeout(timer);
+                if (stopped) return;
+                if (!root.isConnected) {
+                    stopped = true;
+                    onDetach();
+                    return;
+                }
+                if (document.visibilityState !== 'visible') return;
+                const wait = Math.max(0, lastRun + period - Date.now());
+                timer = setTimeout(async () => {
+                    lastRun = Date.now();
+                    try {
+                        await tick();
+                    } finally {
+                        // Keep polling even if a tick fails
+                        schedule(tick);
+                    }
+                }, wait);
+            }
+
+            if (!('BroadcastChannel' in window) || !(navigator.locks && navigator.locks.request)) {
+                document.addEventListener('visibilitychange', () => schedule(refresh));
+                schedule(refresh);
+                return;
+            }
+
+            const ch = new BroadcastChannel('mon-status');
+            let leader = false;
+            let requested = false;
+            let release = null;
+            let last = null;
+
+            async function poll() {
+                const d = await refresh();
+                if (d) {
+                    last = d;
+                    ch.postMessage({type: 'status', data: d});
+                }
+            }
+
+            function lead() {
+                if (stopped || requested || document.visibilityState !== 'visible') return;
+                requested = true;
+                navigator.locks.request('mon-status-leader', () => {
+                    if (document.visibilityState !== 'visible' || !root.isConnected) {
+                        // Hidden or removed while queued: hand the lock straight on
+                        requested = false;
                         return;
                     }
-                    const on = results.filter(r => r.online).length;
-                    const off = results.length - on;
-                    let html = '';
-                    if (on) html += '<span style="color:#22c55e;font-weight:600">' + on + ' online</span>';
-                    if (on && off) html += ' &middot; ';
-                    if (off) html += '<span style="color:#ef4444;font-weight:600">' + off + ' offline</span>';
-                    document.getElementById('mon-widget-text').innerHTML = html;
-                } catch(e) {
-                    document.getElementById('mon-widget-text').innerHTML =
-                        '<span style="color:#ef4444">Error</span>';
+                    leader = true;
+                    schedule(poll);
+                    return new Promise(resolve => { release = resolve; });
+                });
+            }
+
+            function resign() {
+                clearTimeout(timer);
+                leader = false;
+                requested = false;
+                if (release) {
+                    release();
+                    release = null;
                 }
             }
-            refresh();
-            setInterval(refresh, 30000);
+
+            // A detached widget must not keep the lock, or no tab would poll
+            onDetach = () => {
+                resign();
+                ch.close();
+            };
+
+            ch.onmessage = (e) => {
+                const m = e.data || {};
+                if (m.type === 'status' && !leader) render(m.data);
+                else if (m.type === 'hello' && leader && last) ch.postMessage({type: 'status', data: last});
+            };
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'visible') {
+                    ch.postMessage({type: 'hello'});
+                    lead();
+                } else if (leader) {
+                    resign();
+                }
+            });
+            lead();
+            // Ask a running leader for its latest result instead of waiting a full period
+            ch.postMessage({type: 'hello'});
         })();
         </script>
         """
 
-    def _render_settings_page(self) -> str:
-        """Settings page with server management form."""
-        interval = self.context.get_env("MONITORING_CHECK_INTERVAL", "60") if self.context else "60"
-        servers = self._load_servers()
-        servers_json = json.dumps(servers)
-
-        # Build server list HTML server-side (flex divs, no table)
-        if servers:
-            rows = ""
-            for i, s in enumerate(servers):
-                name = html_mod.escape(s.get("name", ""))
-                stype = s.get("type", "ping")
-                type_label = "HTTP(S)" if stype in ("http", "https") else stype.upper()
-                target_raw = s.get("url") or (
-                    s.get("host", "") + (":" + str(s["port"]) if s.get("port") else "")
-                )
-                target = html_mod.escape(target_raw)
-                rows += (
-                    f'<div class="mon-row" id="mon-row-{i}">'
-                    f'<div class="mon-c-type" style="color:#94a3b8;font-size:0.85rem">{type_label}</div>'
-                    f'<div class="mon-c-name" style="font-weight:500">{name}</div>'
-                    f'<div class="mon-c-target" style="color:#94a3b8;font-size:0.85rem">{target}</div>'
-                    f'<div class="mon-c-end" id="mon-st-{i}" style="text-align:center;color:#64748b;font-size:0.85rem">-</div>'
-                    f'</div>'
-                )
-            list_html = (
-                '<div class="mon-row mon-header">'
-                '<div class="mon-c-type">Type</div>'
-                '<div class="mon-c-name">Name</div>'
-                '<div class="mon-c-target">Target</div>'
-                '<div class="mon-c-end" style="text-align:center">Status</div>'
-                '</div>'
-                + rows
-            )
-        else:
-            list_html = '<p style="color:#64748b;margin:0">No servers configured yet. Add one below.</p>'
+_EMPTY_LIST_HTML = '<p style="color:#64748b;margin:0">No servers configured yet. Add one below.</p>'
+
+# Placeholders: {list_html}, {interval}, {js_code}; literal braces are doubled.
+_SETTINGS_PAGE_TEMPLATE = """
+        <style>
+        .mon-row {{ display: flex; align-items: center; padding: 8px 0; border-bottom: 1px solid #1e293b; }}
+        .mon-header {{ border-bottom-color: #334155; color: #94a3b8; font-size: 0.75rem; padding: 4px 0; }}
+        .mon-c-type {{ width: 100px; flex-shrink: 0; padding: 0 8px; }}
+        .mon-c-name {{ flex: 1; min-width: 80px; padding: 0 8px; }}
+        .mon-c-target {{ flex: 2; min-width: 100px; padding: 0 8px; }}
+        .mon-c-end {{ width: 170px; flex-shrink: 0; padding: 0 8px; }}
+        .mon-muted {{ color: #94a3b8; font-size: 0.85rem; }}
+        .mon-strong {{ font-weight: 500; }}
+        .mon-st {{ text-align: center; color: #64748b; font-size: 0.85rem; }}
+        </style>
+        <div class="card" style="margin-bottom:16px">
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:12px">
+                <h3 style="margin:0">Servers</h3>
+                <div id="mon-header-btns">
+                    <button class="btn-sm" onclick="monEnterEdit()" style="margin-right:4px">Edit</button>
+                    <button class="btn-sm" onclick="monTestAll()">Test All</button>
+                </div>
+            </div>
+            <div id="mon-server-list">
+                {list_html}
+            </div>
+            <div id="mon-add-section" style="border-top:1px solid #334155;margin-top:16px;padding-top:16px">
+                <h4 style="margin:0 0 12px 0;font-size:0.9rem;color:#94a3b8">Add Server</h4>
+                <div class="mon-row" style="border-bottom:none;padding:0">
+                    <div class="mon-c-type">
+                        <select id="mon-type" onchange="monTypeChanged()" style="width:100%">
+                            <option value="ping">Ping</option>
+                            <option value="http">HTTP(S)</option>
+                            <option value="ssh">SSH</option>
+                        </select>
+                    </div>
+                    <div class="mon-c-name">
+                        <input id="mon-name" type="text" placeholder="Web Server" style="width:100%">
+                    </div>
+                    <div class="mon-c-target">
+                        <span id="mon-host-wrap" style="display:flex;gap:4px">
+                            <input id="mon-host" type="text" placeholder="192.168.1.1" style="flex:1">
+                            <input id="mon-port" type="text" placeholder="22" style="width:60px;display:none">
+                        </span>
+                        <span id="mon-url-wrap" style="display:none">
+                            <input id="mon-url" type="text" placeholder="https://example.com/health" style="width:100%">
+                        </span>
+                    </div>
+                    <div class="mon-c-end" style="text-align:right">
+                        <button class="btn-sm" onclick="monAdd()">Add</button>
+                    </div>
+                </div>
+            </div>
+        </div>
+        <div class="card">
+            <h3>Settings</h3>
+            <div class="form-row">
+                <label>Check Interval (seconds)</label>
+                <div style="display:flex;gap:6px">
+                    <input id="mon-interval" type="number" value="{interval}" min="10" style="flex:1">
+                    <button class="btn-sm" onclick="monSaveInterval()">Save</button>
+                </div>
+                <small style="color:#64748b">How often the background monitoring loop checks all servers.</small>
+            </div>
+        </div>
+        <script>{js_code}</script>
+        """
 
-        # JavaScript in a regular string to avoid f-string brace escaping
-        js_code = """
+_STATUS_PAGE_HTML = """
+        <style>
+        .mon-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(220px, 1fr)); gap: 12px; }
+        .mon-card { border-radius: 8px; padding: 12px; }
+        .mon-card-name { font-weight: 600; margin-bottom: 4px; }
+        .mon-card-status { font-size: 0.9rem; font-weight: 500; }
+        .mon-card-meta { color: #64748b; font-size: 0.75rem; margin-top: 4px; }
+        .mon-card-rt { color: #64748b; font-size: 0.75rem; margin-top: 2px; }
+        .mon-last { color: #64748b; font-size: 0.75rem; margin-top: 12px; }
+        </style>
+        <div class="card">
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px">
+                <h3 style="margin:0">Server Status</h3>
+                <button class="btn-sm" onclick="monStatusRefresh()">Refresh</button>
+            </div>
+            <div id="mon-status-list">
+                <p style="color:#94a3b8">Checking servers...</p>
+            </div>
+        </div>
+        <template id="mon-card-tpl"><div class="mon-card"><div class="mon-card-name"></div><div class="mon-card-status"></div><div class="mon-card-meta"></div><div class="mon-card-rt"></div></div></template>
+        <script>
+        const MON_ACT_S = '/api/plugins/server_monitoring/action';
+        const MON_CARD = document.getElementById('mon-card-tpl').content.firstElementChild;
+
+        function monMessage(text, color, cls) {
+            const p = document.createElement('p');
+            if (cls) p.className = cls;
+            else p.style.color = color;
+            p.textContent = text;
+            return p;
+        }
+
+        // Server name -> card node, kept across refreshes
+        const monNodes = new Map();
+        const monGrid = document.createElement('div');
+        monGrid.className = 'mon-grid';
+        const monLast = monMessage('', null, 'mon-last');
+
+        // Writes only when the text differs, so unchanged cards cause no reflow
+        function monSetText(node, text) {
+            if (node.textContent !== text) node.textContent = text;
+        }
+
+        // Cards are filled through textContent, so names/hosts are never parsed as HTML
+        function monFillCard(card, r) {
+            if (card.dataset.online !== String(r.online)) {
+                const color = r.online ? '#22c55e' : '#ef4444';
+                card.dataset.online = String(r.online);
+                card.style.background = r.online ? 'rgba(34,197,94,0.1)' : 'rgba(239,68,68,0.1)';
+                card.style.border = '1px solid ' + color + '33';
+                card.children[1].textContent = r.online ? 'Online' : 'Offline';
+                card.children[1].style.color = color;
+            }
+            const typeLabel = (r.type === 'http' || r.type === 'https') ? 'HTTP(S)' : r.type.toUpperCase();
+            monSetText(card.children[0], r.name);
+            monSetText(card.children[2], typeLabel + ' \\u00b7 ' + (r.host || ''));
+            monSetText(card.children[3], 'Response: ' + (r.response_time_ms != null ? r.response_time_ms + ' ms' : '-'));
+        }
+
+        // At most one status request in flight; a newer refresh (timer or
+        // button) or the page being hidden aborts the previous one
+        let monAbort = null;
+
+        async function monStatusRefresh() {
+            const el = document.getElementById('mon-status-list');
+            if (monAbort) monAbort.abort();
+            const ctrl = monAbort = new AbortController();
+            try {
+                const r = await fetch(MON_ACT_S + '/servers/status', {signal: ctrl.signal});
+                const d = await r.json();
+                if (d.check_interval) monPeriod = Math.max(10000, d.check_interval * 1000);
+                const results = d.servers || [];
+                const lastCheck = d.last_check;
+                if (!results.length) {
+                    el.replaceChildren(monMessage('No servers configured. Go to Settings to add servers.', '#64748b'));
+                    return;
+                }
+
+                // Keyed update: reuse each server's card across refreshes and
+                // only touch the DOM where something changed
+                const seen = new Map();
+                results.forEach((r, i) => {
+                    const key = seen.has(r.name) ? r.name + '\\0' + i : r.name;
+                    let card = monNodes.get(key);
+                    if (!card) {
+                        card = MON_CARD.cloneNode(true);
+                        monNodes.set(key, card);
+                    }
+                    monFillCard(card, r);
+                    seen.set(key, card);
+                    // Appending an existing child moves it; skip when already in place
+                    if (monGrid.children[i] !== card) monGrid.insertBefore(card, monGrid.children[i] || null);
+                });
+                for (const [key, card] of monNodes) {
+                    if (!seen.has(key)) {
+                        card.remove();
+                        monNodes.delete(key);
+                    }
+                }
+                if (lastCheck) {
+                    const ago = Math.round((Date.now() / 1000 - lastCheck));
+                    monSetText(monLast, 'Last checked: ' + (ago < 60 ? ago + 's ago' : Math.round(ago / 60) + 'm ago'));
+                } else {
+                    monSetText(monLast, '');
+                }
+                // First render (or after an error/empty state) fills the grid
+                // off-document and attaches it in one go
+                if (!monGrid.isConnected) el.replaceChildren(monGrid, monLast);
+            } catch(e) {
+                if (e.name === 'AbortError') return;
+                el.replaceChildren(monMessage('Failed to check servers: ' + e, '#ef4444'));
+            } finally {
+                if (monAbort === ctrl) monAbort = null;
+            }
+        }
+
+        // Auto-refresh only while the page is visible; catch up on re-focus.
+        // The period follows the server's check interval once it is known.
+        let monPeriod = 30000;
+        let monLastRun = 0;
+        let monTimer = null;
+
+        function monSchedule() {
+            clearTimeout(monTimer);
+            if (document.visibilityState !== 'visible') return;
+            const wait = Math.max(0, monLastRun + monPeriod - Date.now());
+            monTimer = setTimeout(async () => {
+                monLastRun = Date.now();
+                await monStatusRefresh();
+                monSchedule();
+            }, wait);
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.hidden && monAbort) monAbort.abort();
+            monSchedule();
+        });
+        monSchedule();
+        </script>
+        """
+
+# JavaScript in a regular string to avoid f-string brace escaping;
+# __SERVERS_JSON__ and __STATUS_JSON__ are replaced with the server list and
+# the last known statuses at render time.
+_SETTINGS_JS_TEMPLATE = """
 (function() {
     var MON_ACT = '/api/plugins/server_monitoring/action';
     var monServers = __SERVERS_JSON__;
     var monEditMode = false;
     var monEditServers = [];
+    // Last known status per server config (name + target), re-applied when
+    // rows are re-rendered; same-named servers keep separate statuses
+    var monStatusByKey = {};
+
+    function monKey(s) {
+        return JSON.stringify([s.name, s.type, s.host || '', String(s.port || ''), s.url || '']);
+    }
+
+    var ESC_MAP = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
 
     function _esc(s) {
         if (!s && s !== 0) return '';
-        var d = document.createElement('div');
-        d.textContent = String(s);
-        return d.innerHTML.replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+        return String(s).replace(/[&<>"']/g, function(c) { return ESC_MAP[c]; });
     }
 
     function monRender(servers) {
@@ -426,22 +924,23 @@ class ServerMonitoringPlugin(PluginBase):
             el.innerHTML = '<p style="color:#64748b;margin:0">No servers configured yet. Add one below.</p>';
             return;
         }
-        var h = '<div class="mon-row mon-header">'
+        var h = ['<div class="mon-row mon-header">'
             + '<div class="mon-c-type">Type</div>'
             + '<div class="mon-c-name">Name</div>'
             + '<div class="mon-c-target">Target</div>'
-            + '<div class="mon-c-end" style="text-align:center">Status</div></div>';
+            + '<div class="mon-c-end" style="text-align:center">Status</div></div>'];
         servers.forEach(function(s, i) {
             var tl = (s.type === 'http' || s.type === 'https') ? 'HTTP(S)' : s.type.toUpperCase();
             var tgt = s.url || (s.host + (s.port ? ':' + s.port : ''));
-            h += '<div class="mon-row" id="mon-row-' + i + '">'
-                + '<div class="mon-c-type" style="color:#94a3b8;font-size:0.85rem">' + tl + '</div>'
-                + '<div class="mon-c-name" style="font-weight:500">' + _esc(s.name) + '</div>'
-                + '<div class="mon-c-target" style="color:#94a3b8;font-size:0.85rem">' + _esc(tgt) + '</div>'
-                + '<div class="mon-c-end" id="mon-st-' + i + '" style="text-align:center;color:#64748b;font-size:0.85rem">-</div>'
-                + '</div>';
+            h.push('<div class="mon-row" id="mon-row-' + i + '">'
+                + '<div class="mon-c-type mon-muted">' + tl + '</div>'
+                + '<div class="mon-c-name mon-strong">' + _esc(s.name) + '</div>'
+                + '<div class="mon-c-target mon-muted">' + _esc(tgt) + '</div>'
+                + '<div class="mon-c-end mon-st" id="mon-st-' + i + '">-</div>'
+                + '</div>');
         });
-        el.innerHTML = h;
+        // One row string per server, joined once
+        el.innerHTML = h.join('');
     }
 
     function monRenderEdit(servers) {
@@ -451,15 +950,15 @@ class ServerMonitoringPlugin(PluginBase):
             el.innerHTML = '<p style="color:#64748b;margin:0">No servers configured.</p>';
             return;
         }
-        var h = '<div class="mon-row mon-header">'
+        var h = ['<div class="mon-row mon-header">'
             + '<div class="mon-c-type">Type</div>'
             + '<div class="mon-c-name">Name</div>'
             + '<div class="mon-c-target">Target</div>'
-            + '<div class="mon-c-end"></div></div>';
+            + '<div class="mon-c-end"></div></div>'];
         servers.forEach(function(s, i) {
             var isHttp = s.type === 'http' || s.type === 'https';
             var isSsh = s.type === 'ssh';
-            h += '<div class="mon-row" id="mon-row-' + i + '">'
+            h.push('<div class="mon-row" id="mon-row-' + i + '">'
                 + '<div class="mon-c-type">'
                 + '<select id="mon-et-' + i + '" onchange="monEditType(' + i + ')" style="width:100%">'
                 + '<option value="ping"' + (s.type === 'ping' ? ' selected' : '') + '>Ping</option>'
@@ -480,20 +979,27 @@ class ServerMonitoringPlugin(PluginBase):
                 + '</div>'
                 + '<div class="mon-c-end" style="text-align:right">'
                 + '<button class="btn-sm" onclick="monDel(' + i + ')" style="font-size:0.75rem;padding:2px 8px;background:#7f1d1d">Del</button>'
-                + '</div></div>';
+                + '</div></div>');
         });
-        el.innerHTML = h;
+        el.innerHTML = h.join('');
     }
 
-    async function monRefresh() {
-        try {
-            var r = await fetch(MON_ACT + '/servers/list');
-            var d = await r.json();
-            monRender(d.servers || []);
-        } catch(e) {
-            var el = document.getElementById('mon-server-list');
-            if (el) el.innerHTML = '<p style="color:#ef4444">Failed to load servers: ' + e + '</p>';
-        }
+    // results are in server list order, like servers/status and test_all
+    function monApplyStatuses(results) {
+        results.forEach(function(x, i) {
+            if (monServers[i]) monStatusByKey[monKey(monServers[i])] = x;
+        });
+        if (monEditMode) return;
+        monServers.forEach(function(s, i) {
+            var st = monStatusByKey[monKey(s)];
+            if (st) monApplyStatus(i, st);
+        });
+    }
+
+    // Re-render from a list the page already has, without a round-trip
+    function monRenderLocal(servers) {
+        monRender(servers);
+        monApplyStatuses([]);
     }
 
     function monUpdateHeaderBtns() {
@@ -519,7 +1025,7 @@ class ServerMonitoringPlugin(PluginBase):
 
     window.monExitEdit = function() {
         monEditMode = false;
-        monRefresh();
+        monRenderLocal(monServers);
         monUpdateHeaderBtns();
         var addSec = document.getElementById('mon-add-section');
         if (addSec) addSec.style.display = '';
@@ -586,7 +1092,7 @@ class ServerMonitoringPlugin(PluginBase):
                 document.getElementById('mon-host').value = '';
                 document.getElementById('mon-port').value = '';
                 document.getElementById('mon-url').value = '';
-                monRefresh();
+                monRenderLocal(monServers.concat([d.server]));
                 try { toast('Server added!', 'success'); } catch(_) {}
             } else {
                 var msg = d.error || 'Failed to add server';
@@ -638,7 +1144,7 @@ class ServerMonitoringPlugin(PluginBase):
             var d = await r.json();
             if (d.success) {
                 monEditMode = false;
-                monRefresh();
+                monRenderLocal(d.servers || servers);
                 monUpdateHeaderBtns();
                 var addSec = document.getElementById('mon-add-section');
                 if (addSec) addSec.style.display = '';
@@ -652,34 +1158,55 @@ class ServerMonitoringPlugin(PluginBase):
         }
     };
 
-    window.monTest = async function(index) {
+    function monApplyStatus(index, d) {
+        if (monServers[index]) monStatusByKey[monKey(monServers[index])] = d;
         var el = document.getElementById('mon-st-' + index);
         if (!el) return;
-        el.innerHTML = '...';
-        el.style.color = '#94a3b8';
+        var rt = d.response_time_ms != null ? ' (' + d.response_time_ms + 'ms)' : '';
+        if (d.online) {
+            el.innerHTML = '&#9679; Online' + rt;
+            el.style.color = '#22c55e';
+        } else {
+            el.innerHTML = '&#9679; Offline';
+            el.style.color = '#ef4444';
+        }
+    }
+
+    function monMarkStatus(index, text, color) {
+        var el = document.getElementById('mon-st-' + index);
+        if (!el) return;
+        el.innerHTML = text;
+        el.style.color = color;
+    }
+
+    window.monTest = async function(index) {
+        monMarkStatus(index, '...', '#94a3b8');
         try {
             var r = await fetch(MON_ACT + '/servers/' + index + '/test', {method: 'POST'});
-            var d = await r.json();
-            var rt = d.response_time_ms != null ? ' (' + d.response_time_ms + 'ms)' : '';
-            if (d.online) {
-                el.innerHTML = '&#9679; Online' + rt;
-                el.style.color = '#22c55e';
-            } else {
-                el.innerHTML = '&#9679; Offline';
-                el.style.color = '#ef4444';
-            }
+            monApplyStatus(index, await r.json());
         } catch(e) {
-            el.innerHTML = 'Error';
-            el.style.color = '#ef4444';
+            monMarkStatus(index, 'Error', '#ef4444');
         }
     };
 
     window.monTestAll = async function() {
-        for (var i = 0; i < monServers.length; i++) window.monTest(i);
+        var i;
+        for (i = 0; i < monServers.length; i++) monMarkStatus(i, '...', '#94a3b8');
+        try {
+            var r = await fetch(MON_ACT + '/servers/test_all', {method: 'POST'});
+            var d = await r.json();
+            (d.results || []).forEach(function(x, i) { monApplyStatus(i, x); });
+        } catch(e) {
+            for (i = 0; i < monServers.length; i++) monMarkStatus(i, 'Error', '#ef4444');
+        }
     };
 
     window.monSaveInterval = async function() {
-        var val = document.getElementById('mon-interval').value;
+        // Same rules as _get_interval: default only when not a number, then
+        // clamp to the 10 s floor (0 or negative would make the loop spin)
+        var n = parseInt(document.getElementById('mon-interval').value, 10);
+        var val = String(Math.max(10, isNaN(n) ? 60 : n));
+        document.getElementById('mon-interval').value = val;
         try {
             await fetch('/api/config/', {
                 method: 'PUT',
@@ -691,125 +1218,8 @@ class ServerMonitoringPlugin(PluginBase):
             try { toast('Save failed: ' + e, 'error'); } catch(_) { alert('Save failed: ' + e); }
         }
     };
-})();
-""".replace("__SERVERS_JSON__", servers_json)
 
-        return f"""
-        <style>
-        .mon-row {{ display: flex; align-items: center; padding: 8px 0; border-bottom: 1px solid #1e293b; }}
-        .mon-header {{ border-bottom-color: #334155; color: #94a3b8; font-size: 0.75rem; padding: 4px 0; }}
-        .mon-c-type {{ width: 100px; flex-shrink: 0; padding: 0 8px; }}
-        .mon-c-name {{ flex: 1; min-width: 80px; padding: 0 8px; }}
-        .mon-c-target {{ flex: 2; min-width: 100px; padding: 0 8px; }}
-        .mon-c-end {{ width: 170px; flex-shrink: 0; padding: 0 8px; }}
-        </style>
-        <div class="card" style="margin-bottom:16px">
-            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:12px">
-                <h3 style="margin:0">Servers</h3>
-                <div id="mon-header-btns">
-                    <button class="btn-sm" onclick="monEnterEdit()" style="margin-right:4px">Edit</button>
-                    <button class="btn-sm" onclick="monTestAll()">Test All</button>
-                </div>
-            </div>
-            <div id="mon-server-list">
-                {list_html}
-            </div>
-            <div id="mon-add-section" style="border-top:1px solid #334155;margin-top:16px;padding-top:16px">
-                <h4 style="margin:0 0 12px 0;font-size:0.9rem;color:#94a3b8">Add Server</h4>
-                <div class="mon-row" style="border-bottom:none;padding:0">
-                    <div class="mon-c-type">
-                        <select id="mon-type" onchange="monTypeChanged()" style="width:100%">
-                            <option value="ping">Ping</option>
-                            <option value="http">HTTP(S)</option>
-                            <option value="ssh">SSH</option>
-                        </select>
-                    </div>
-                    <div class="mon-c-name">
-                        <input id="mon-name" type="text" placeholder="Web Server" style="width:100%">
-                    </div>
-                    <div class="mon-c-target">
-                        <span id="mon-host-wrap" style="display:flex;gap:4px">
-                            <input id="mon-host" type="text" placeholder="192.168.1.1" style="flex:1">
-                            <input id="mon-port" type="text" placeholder="22" style="width:60px;display:none">
-                        </span>
-                        <span id="mon-url-wrap" style="display:none">
-                            <input id="mon-url" type="text" placeholder="https://example.com/health" style="width:100%">
-                        </span>
-                    </div>
-                    <div class="mon-c-end" style="text-align:right">
-                        <button class="btn-sm" onclick="monAdd()">Add</button>
-                    </div>
-                </div>
-            </div>
-        </div>
-        <div class="card">
-            <h3>Settings</h3>
-            <div class="form-row">
-                <label>Check Interval (seconds)</label>
-                <div style="display:flex;gap:6px">
-                    <input id="mon-interval" type="number" value="{interval}" min="10" style="flex:1">
-                    <button class="btn-sm" onclick="monSaveInterval()">Save</button>
-                </div>
-                <small style="color:#64748b">How often the background monitoring loop checks all servers.</small>
-            </div>
-        </div>
-        <script>{js_code}</script>
-        """
-
-    def _render_status_page(self) -> str:
-        """Live status page with auto-refresh."""
-        return """
-        <div class="card">
-            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px">
-                <h3 style="margin:0">Server Status</h3>
-                <button class="btn-sm" onclick="monStatusRefresh()">Refresh</button>
-            </div>
-            <div id="mon-status-list">
-                <p style="color:#94a3b8">Checking servers...</p>
-            </div>
-        </div>
-        <script>
-        const MON_ACT_S = '/api/plugins/server_monitoring/action';
-
-        async function monStatusRefresh() {
-            const el = document.getElementById('mon-status-list');
-            try {
-                const r = await fetch(MON_ACT_S + '/servers/status');
-                const d = await r.json();
-                const results = d.servers || [];
-                const lastCheck = d.last_check;
-                if (!results.length) {
-                    el.innerHTML = '<p style="color:#64748b">No servers configured. Go to Settings to add servers.</p>';
-                    return;
-                }
-
-                let html = '<div style="display:grid;grid-template-columns:repeat(auto-fill,minmax(220px,1fr));gap:12px">';
-                results.forEach((r, i) => {
-                    const color = r.online ? '#22c55e' : '#ef4444';
-                    const status = r.online ? 'Online' : 'Offline';
-                    const bg = r.online ? 'rgba(34,197,94,0.1)' : 'rgba(239,68,68,0.1)';
-                    const typeLabel = (r.type === 'http' || r.type === 'https') ? 'HTTP(S)' : r.type.toUpperCase();
-                    const rtMs = r.response_time_ms != null ? r.response_time_ms + ' ms' : '-';
-                    html += '<div style="background:' + bg + ';border:1px solid ' + color + '33;border-radius:8px;padding:12px">'
-                        + '<div style="font-weight:600;margin-bottom:4px">' + r.name + '</div>'
-                        + '<div style="color:' + color + ';font-size:0.9rem;font-weight:500">' + status + '</div>'
-                        + '<div style="color:#64748b;font-size:0.75rem;margin-top:4px">' + typeLabel + ' &middot; ' + (r.host || '') + '</div>'
-                        + '<div style="color:#64748b;font-size:0.75rem;margin-top:2px">Response: ' + rtMs + '</div>'
-                        + '</div>';
-                });
-                html += '</div>';
-                if (lastCheck) {
-                    const ago = Math.round((Date.now() / 1000 - lastCheck));
-                    html += '<p style="color:#64748b;font-size:0.75rem;margin-top:12px">Last checked: '
-                        + (ago < 60 ? ago + 's ago' : Math.round(ago / 60) + 'm ago') + '</p>';
-                }
-                el.innerHTML = html;
-            } catch(e) {
-                el.innerHTML = '<p style="color:#ef4444">Failed to check servers: ' + e + '</p>';
-            }
-        }
-
-        monStatusRefresh();
-        setInterval(monStatusRefresh, 30000);
-        </script>
-        """
+    monRender(monServers);
+    monApplyStatuses(__STATUS_JSON__);
+})();
+"""